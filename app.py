@@ -1,12 +1,16 @@
+import copy
 import io
+import json
+import re
 from datetime import date
-from typing import List, Dict, Any
+from operator import itemgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Dict, Any, Mapping, Tuple
 
-import pandas as pd
 import streamlit as st
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # -------------------------------
@@ -33,8 +37,11 @@ INDUSTRIES = [
     "Other"
 ]
 RISK_APPETITES = ["Low", "Medium", "High"]
+# Probability/Impact label -> score; unknown labels count as Medium (2)
+SCORE: Mapping[str, int] = MappingProxyType({"Low": 1, "Medium": 2, "High": 3})
 
-DEFAULT_GOV_ROLES = [
+# Read-only template; init_state copies it into session state
+DEFAULT_GOV_ROLES = tuple(MappingProxyType(d) for d in [
     {"Role": "Executive Sponsor", "Name": "", "Decision Rights": "Approves scope, budget, major changes; resolves escalations"},
     {"Role": "Steering Committee", "Name": "", "Decision Rights": "Endorses direction; risk review; executive alignment"},
     {"Role": "Program/Project Director", "Name": "", "Decision Rights": "Governance orchestration; priorities; risk acceptance (within thresholds)"},
@@ -44,11 +51,11 @@ DEFAULT_GOV_ROLES = [
     {"Role": "Business Analyst", "Name": "", "Decision Rights": "Requirements approach; traceability"},
     {"Role": "QA / Test Lead", "Name": "", "Decision Rights": "Test strategy; quality gates"},
     {"Role": "Change & Comms Lead", "Name": "", "Decision Rights": "Change impacts; training & comms plan"},
-]
+])
 
 # Simple industry & method-aware risk library
 BASE_RISKS = {
-    "Common": [
+    "Common": (
         "Scope creep due to unclear requirements or stakeholder changes",
         "Resource constraints or key person dependency",
         "Vendor or third-party delays impacting critical path",
@@ -59,76 +66,78 @@ BASE_RISKS = {
         "Budget overrun due to change or market costs",
         "Insufficient change management causes poor adoption",
         "Environment or infrastructure readiness delays"
-    ],
-    "Information Technology / Software": [
+    ),
+    "Information Technology / Software": (
         "Requirements churn due to evolving business needs",
         "Technical debt or legacy constraints impacting velocity",
         "Performance/scalability issues discovered late",
         "Environment instability or CI/CD pipeline failures"
-    ],
-    "Infrastructure / Construction": [
+    ),
+    "Infrastructure / Construction": (
         "Permitting/approvals delays impact start dates",
         "Site conditions differ from surveys impacting design/cost",
         "Weather events disrupt critical path activities",
         "Safety incidents cause stoppages"
-    ],
-    "Healthcare": [
+    ),
+    "Healthcare": (
         "Privacy and clinical safety requirements cause rework",
         "Clinical workflow change resistance limits adoption",
         "Interoperability challenges with EMR/EHR systems"
-    ],
-    "Financial Services": [
+    ),
+    "Financial Services": (
         "Regulatory change introduces additional controls",
         "Audit findings drive unplanned remediation",
         "Compliance approval cycle extends timelines"
-    ],
-    "Government / Public Sector": [
+    ),
+    "Government / Public Sector": (
         "Procurement timelines extend beyond forecast",
         "Policy changes alter project objectives",
         "Public scrutiny/media require additional assurance"
-    ],
-    "Education": [
+    ),
+    "Education": (
         "Academic calendar constraints limit deployment windows",
         "Stakeholder availability limited outside terms",
         "Digital accessibility requirements add scope"
-    ]
+    )
 }
 
+# Session state keys that make up the plan (and its cache key)
+PLAN_FIELDS = (
+    "outcome", "methodology", "industry", "risk_appetite", "drivers", "objectives",
+    "scope_summary", "governance_roles", "gov_cadence", "gov_escalation", "include_raci",
+    "raci_rows", "risks", "milestones", "comms", "success_measures",
+)
 
-def p_label_to_score(label: str) -> int:
-    mapping = {"Low": 1, "Medium": 2, "High": 3}
-    return mapping.get(label, 2)
-
-
-def i_label_to_score(label: str) -> int:
-    mapping = {"Low": 1, "Medium": 2, "High": 3}
-    return mapping.get(label, 2)
+# Driver keywords -> draft objective, checked in order against the keywords found in the drivers
+_OBJ_RULES = [
+    ({"risk"}, "Reduce high-priority delivery risks with proactive mitigations and fast feedback"),
+    ({"cost", "budget"}, "Control total cost within the approved budget envelope"),
+    ({"speed", "time"}, "Meet or accelerate the target timeline through critical path focus"),
+    ({"quality"}, "Achieve quality targets measured by defect rates and user satisfaction"),
+    ({"compliance"}, "Comply with applicable regulatory and policy requirements with evidence"),
+]
+# One alternation of every rule keyword; substring match, so "Reduce costs" or "Tight timeline" still count
+_KW_RE = re.compile("|".join(sorted(set().union(*(k for k, _ in _OBJ_RULES)))))
 
 
 def suggest_objectives(outcome: str, methodology: str, drivers: List[str]) -> List[str]:
-    out = []
-    if not outcome.strip():
-        return out
-    out.append(f"Deliver the defined outcome: {outcome.strip()}")
+    outcome = outcome.strip()
+    if not outcome:
+        return []
+    out = [f"Deliver the defined outcome: {outcome}"]
 
     # SMART-ish prompts
     out.append("Define measurable KPIs and acceptance criteria aligned to business value")
     out.append("Deliver scope in agreed increments with clear Definition of Done" if methodology == "Agile"
                else "Deliver scope by phase with approved entry/exit criteria")
-    if "risk" in " ".join(drivers).lower():
-        out.append("Reduce high-priority delivery risks with proactive mitigations and fast feedback")
-    if "cost" in " ".join(drivers).lower() or "budget" in " ".join(drivers).lower():
-        out.append("Control total cost within the approved budget envelope")
-    if "speed" in " ".join(drivers).lower() or "time" in " ".join(drivers).lower():
-        out.append("Meet or accelerate the target timeline through critical path focus")
-    if "quality" in " ".join(drivers).lower():
-        out.append("Achieve quality targets measured by defect rates and user satisfaction")
-    if "compliance" in " ".join(drivers).lower():
-        out.append("Comply with applicable regulatory and policy requirements with evidence")
+    found = set(m.group() for m in _KW_RE.finditer(" ".join(drivers).lower()))
+    for keywords, objective in _OBJ_RULES:
+        if keywords & found:
+            out.append(objective)
     return out
 
 
-def suggest_risks(industry: str, methodology: str) -> List[str]:
+def suggest_risks(industry: str, methodology: str) -> Tuple[str, ...]:
     risks = []
     risks.extend(BASE_RISKS["Common"])
     if industry in BASE_RISKS:
@@ -143,116 +152,126 @@ def suggest_risks(industry: str, methodology: str) -> List[str]:
         risks.append("Hybrid governance causes ambiguity in decision rights")
         risks.append("Phase gates misaligned with agile increments")
     # Deduplicate while preserving order
-    seen = set()
-    deduped = []
-    for r in risks:
-        if r not in seen:
-            seen.add(r)
-            deduped.append(r)
-    return deduped
+    return tuple(dict.fromkeys(risks))
+
+
+# Suggested risks for every (industry, methodology) pair. Streamlit re-executes this script on
+# each rerun, so the table is rebuilt from BASE_RISKS every run and edits to the library apply immediately.
+PRECOMPUTED_RISKS: Mapping[Tuple[str, str], Tuple[str, ...]] = MappingProxyType(
+    {(i, m): suggest_risks(i, m) for i in INDUSTRIES for m in METHODOLOGIES}
+)
+
+
+def row_count(cols: Mapping[str, List[Any]]) -> int:
+    """Number of rows in a column-stored table ({column: values})."""
+    return len(next(iter(cols.values()), []))
 
 
-def plan_markdown(model: Dict[str, Any]) -> str:
+def records(cols: Mapping[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Row dicts for a column-stored table, for the plan renderers."""
+    return [dict(zip(cols, row)) for row in zip(*cols.values())]
+
+
+def _md_table(rows: List[Dict[str, Any]], cols: List[str]) -> str:
+    """Render records as a pipe-style Markdown table (missing values left blank)."""
+    out = ["| " + " | ".join(cols) + " |", "|" + "---|" * len(cols)]
+    out.extend(
+        "| " + " | ".join("" if r.get(c) is None else str(r.get(c)) for c in cols) + " |"
+        for r in rows
+    )
+    return "\n".join(out)
+
+
+_SECTION = "## {n}. {title}\n{body}\n"
+
+
+def plan_markdown(model: Mapping[str, Any]) -> str:
     """Render final plan to Markdown."""
-    lines = []
-    L = lines.append
+    sections = []
+    L = sections.append
 
     # Header
-    L(f"# Project Management Plan")
-    L("")
-    L(f"**Project/Outcome:** {model['outcome'] or 'TBD'}")
-    L(f"**Methodology:** {model['methodology']}  ")
-    L(f"**Industry:** {model['industry']}  ")
-    L(f"**Risk Appetite:** {model['risk_appetite']}")
-    L("")
-    L("---")
+    L(
+        "# Project Management Plan\n\n"
+        f"**Project/Outcome:** {model['outcome'] or 'TBD'}\n"
+        f"**Methodology:** {model['methodology']}  \n"
+        f"**Industry:** {model['industry']}  \n"
+        f"**Risk Appetite:** {model['risk_appetite']}\n\n"
+        "---"
+    )
 
     # Objectives
-    L("## 1. Objectives")
     if model["objectives"]:
-        for i, obj in enumerate(model["objectives"], 1):
-            L(f"{i}. {obj}")
+        body = "\n".join(f"{i}. {obj}" for i, obj in enumerate(model["objectives"], 1))
     else:
-        L("_No objectives captured yet_")
-    L("")
+        body = "_No objectives captured yet_"
+    L(_SECTION.format(n=1, title="Objectives", body=body))
 
     # Scope Summary (lightweight prompt from outcome)
-    L("## 2. Scope Summary")
     scope_summary = model.get("scope_summary", "").strip()
-    if scope_summary:
-        L(scope_summary)
-    else:
-        L("Summarize in-scope and out-of-scope items, key deliverables, and assumptions.")  # prompt
-    L("")
+    body = scope_summary or "Summarize in-scope and out-of-scope items, key deliverables, and assumptions."  # prompt
+    L(_SECTION.format(n=2, title="Scope Summary", body=body))
 
     # Governance
-    L("## 3. Governance")
-    L(f"**Governance cadence:** {model.get('gov_cadence','TBD')}  ")
-    L(f"**Escalation path:** {model.get('gov_escalation','TBD')}")
-    L("")
-    L("### 3.1 Roles & Decision Rights")
-    if model["governance_roles"]:
-        df = pd.DataFrame(model["governance_roles"])
-        L(df.to_markdown(index=False))
+    if row_count(model["governance_roles"]):
+        roles = _md_table(records(model["governance_roles"]), ["Role", "Name", "Decision Rights"])
     else:
-        L("_No governance roles captured yet_")
-    L("")
+        roles = "_No governance roles captured yet_"
+    body = (
+        f"**Governance cadence:** {model.get('gov_cadence','TBD')}  \n"
+        f"**Escalation path:** {model.get('gov_escalation','TBD')}\n\n"
+        f"### 3.1 Roles & Decision Rights\n{roles}\n"
+    )
     if model.get("include_raci"):
-        L("### 3.2 RACI (Indicative)")
-        L("| Deliverable/Activity | R | A | C | I |")
-        L("|---|---|---|---|---|")
-        for row in model.get("raci_rows", []):
-            L(f"| {row['Item']} | {row['R']} | {row['A']} | {row['C']} | {row['I']} |")
-        if not model.get("raci_rows"):
-            L("_Add RACI entries in the app to include them here._")
-    L("")
+        raci = ["### 3.2 RACI (Indicative)", "| Deliverable/Activity | R | A | C | I |", "|---|---|---|---|---|"]
+        raci.extend(
+            f"| {row['Item']} | {row['R']} | {row['A']} | {row['C']} | {row['I']} |"
+            for row in records(model.get("raci_rows", {}))
+        )
+        if not row_count(model.get("raci_rows", {})):
+            raci.append("_Add RACI entries in the app to include them here._")
+        body += "\n" + "\n".join(raci)
+    L(_SECTION.format(n=3, title="Governance", body=body))
 
     # Risks
-    L("## 4. Risks & Mitigations")
-    if model["risks"]:
-        df = pd.DataFrame(model["risks"])
-        df = df.assign(
-            ProbabilityScore=df["Probability"].map(p_label_to_score),
-            ImpactScore=df["Impact"].map(i_label_to_score),
-            RiskScore=lambda d: d["ProbabilityScore"] * d["ImpactScore"]
-        ).sort_values("RiskScore", ascending=False)
-        # Render selected columns
-        L(df[["Risk", "Probability", "Impact", "Mitigation", "Owner"]].to_markdown(index=False))
+    if row_count(model["risks"]):
+        risks = sorted(records(model["risks"]), key=itemgetter("_score"), reverse=True)
+        body = _md_table(risks, ["Risk", "Probability", "Impact", "Mitigation", "Owner"])
     else:
-        L("_No risks captured yet_")
-    L("")
+        body = "_No risks captured yet_"
+    L(_SECTION.format(n=4, title="Risks & Mitigations", body=body))
 
     # Milestones
-    L("## 5. Milestones & Timeline")
-    if model["milestones"]:
-        dfm = pd.DataFrame(model["milestones"])
-        L(dfm.to_markdown(index=False))
+    if row_count(model["milestones"]):
+        body = _md_table(records(model["milestones"]), ["Milestone", "Date", "Acceptance Criteria"])
     else:
-        L("_Add key milestones, dates, and acceptance criteria._")
-    L("")
+        body = "_Add key milestones, dates, and acceptance criteria._"
+    L(_SECTION.format(n=5, title="Milestones & Timeline", body=body))
 
     # Stakeholders & Comms
-    L("## 6. Stakeholders & Communications")
-    if model["comms"]:
-        dfc = pd.DataFrame(model["comms"])
-        L(dfc.to_markdown(index=False))
+    if row_count(model["comms"]):
+        body = _md_table(records(model["comms"]), ["Stakeholder", "Information Needs", "Channel", "Frequency", "Owner"])
     else:
-        L("_Define stakeholders, information needs, channels, frequency, and owner._")
-    L("")
+        body = "_Define stakeholders, information needs, channels, frequency, and owner._"
+    L(_SECTION.format(n=6, title="Stakeholders & Communications", body=body))
 
     # Success Measures
-    L("## 7. Success Measures")
     if model["success_measures"]:
-        for i, kpi in enumerate(model["success_measures"], 1):
-            L(f"{i}. {kpi}")
+        body = "\n".join(f"{i}. {kpi}" for i, kpi in enumerate(model["success_measures"], 1))
     else:
-        L("_Define measurable KPIs and acceptance criteria._")
-    L("")
-    return "\n".join(lines)
+        body = "_Define measurable KPIs and acceptance criteria._"
+    L(_SECTION.format(n=7, title="Success Measures", body=body))
+    return "\n".join(sections)
 
 
-def plan_docx(markdown_model: Dict[str, Any]) -> bytes:
+def plan_docx(markdown_model: Mapping[str, Any]) -> io.BytesIO:
     """Create a DOCX version of the plan with simple styles."""
+    # Imported here: python-docx is only needed when a Word export is built
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.table import _Cell
+
     doc = Document()
 
     # Title
@@ -285,6 +304,19 @@ def plan_docx(markdown_model: Dict[str, Any]) -> bytes:
     def bullet(txt):
         p = doc.add_paragraph(txt, style="List Bullet")
 
+    def table(headers, fields, rows):
+        # Clone the header <w:tr> per row; much cheaper than table.add_row()
+        t = doc.add_table(rows=1, cols=len(headers))
+        template = t.rows[0]._tr
+        for tc, txt in zip(template.tc_lst, headers):
+            _Cell(tc, t).text = txt
+        for rec in rows:
+            tr = copy.deepcopy(template)
+            t._tbl.append(tr)
+            for tc, field in zip(tr.tc_lst, fields):
+                value = rec.get(field)
+                _Cell(tc, t).text = "" if value is None else str(value)
+
     doc.add_paragraph()
 
     # Objectives
@@ -306,101 +338,48 @@ def plan_docx(markdown_model: Dict[str, Any]) -> bytes:
     doc.add_paragraph(f"Escalation path: {markdown_model.get('gov_escalation', 'TBD')}")
     doc.add_paragraph("3.1 Roles & Decision Rights").runs[0].bold = True
 
-    if markdown_model["governance_roles"]:
-        table = doc.add_table(rows=1, cols=3)
-        hdr = table.rows[0].cells
-        hdr[0].text = "Role"
-        hdr[1].text = "Name"
-        hdr[2].text = "Decision Rights"
-        for r in markdown_model["governance_roles"]:
-            row = table.add_row().cells
-            row[0].text = r.get("Role", "")
-            row[1].text = r.get("Name", "")
-            row[2].text = r.get("Decision Rights", "")
+    roles = records(markdown_model["governance_roles"])
+    if roles:
+        fields = ["Role", "Name", "Decision Rights"]
+        table(fields, fields, roles)
     else:
         doc.add_paragraph("No governance roles defined.")
 
     if markdown_model.get("include_raci"):
         doc.add_paragraph("3.2 RACI (Indicative)").runs[0].bold = True
-        raci_rows = markdown_model.get("raci_rows", [])
+        raci_rows = records(markdown_model.get("raci_rows", {}))
         if raci_rows:
-            table = doc.add_table(rows=1, cols=5)
-            hdr = table.rows[0].cells
-            hdr[0].text = "Deliverable/Activity"
-            hdr[1].text = "R"
-            hdr[2].text = "A"
-            hdr[3].text = "C"
-            hdr[4].text = "I"
-            for row in raci_rows:
-                r = table.add_row().cells
-                r[0].text = row.get("Item", "")
-                r[1].text = row.get("R", "")
-                r[2].text = row.get("A", "")
-                r[3].text = row.get("C", "")
-                r[4].text = row.get("I", "")
+            table(["Deliverable/Activity", "R", "A", "C", "I"], ["Item", "R", "A", "C", "I"], raci_rows)
         else:
             doc.add_paragraph("Add RACI entries in the app to include them here.")
 
     # Risks
     h("4. Risks & Mitigations")
-    risks = markdown_model["risks"]
+    risks = records(markdown_model["risks"])
     if risks:
-        table = doc.add_table(rows=1, cols=5)
-        hdr = table.rows[0].cells
-        hdr[0].text = "Risk"
-        hdr[1].text = "Probability"
-        hdr[2].text = "Impact"
-        hdr[3].text = "Mitigation"
-        hdr[4].text = "Owner"
-        # sort by score
-        df = pd.DataFrame(risks)
-        df["ProbabilityScore"] = df["Probability"].map(p_label_to_score)
-        df["ImpactScore"] = df["Impact"].map(i_label_to_score)
-        df["RiskScore"] = df["ProbabilityScore"] * df["ImpactScore"]
-        df = df.sort_values("RiskScore", ascending=False)
-        for _, r in df.iterrows():
-            row = table.add_row().cells
-            row[0].text = str(r["Risk"])
-            row[1].text = str(r["Probability"])
-            row[2].text = str(r["Impact"])
-            row[3].text = str(r.get("Mitigation", ""))
-            row[4].text = str(r.get("Owner", ""))
+        fields = ["Risk", "Probability", "Impact", "Mitigation", "Owner"]
+        # sort by score (precomputed on edit in the Risks tab)
+        table(fields, fields, sorted(risks, key=itemgetter("_score"), reverse=True))
     else:
         doc.add_paragraph("No risks captured yet.")
 
     # Milestones
     h("5. Milestones & Timeline")
-    if markdown_model["milestones"]:
-        mt = doc.add_table(rows=1, cols=3)
-        mh = mt.rows[0].cells
-        mh[0].text = "Milestone"
-        mh[1].text = "Target Date"
-        mh[2].text = "Acceptance Criteria"
-        for m in markdown_model["milestones"]:
-            row = mt.add_row().cells
-            row[0].text = m.get("Milestone", "")
-            row[1].text = str(m.get("Date", ""))
-            row[2].text = m.get("Acceptance Criteria", "")
+    milestones = records(markdown_model["milestones"])
+    if milestones:
+        table(["Milestone", "Target Date", "Acceptance Criteria"],
+              ["Milestone", "Date", "Acceptance Criteria"],
+              milestones)
     else:
         doc.add_paragraph("Add key milestones, dates, and acceptance criteria.")
 
     # Stakeholders & Comms
     h("6. Stakeholders & Communications")
-    if markdown_model["comms"]:
-        ct = doc.add_table(rows=1, cols=5)
-        ch = ct.rows[0].cells
-        ch[0].text = "Stakeholder/Group"
-        ch[1].text = "Information Needs"
-        ch[2].text = "Channel"
-        ch[3].text = "Frequency"
-        ch[4].text = "Owner"
-        for c in markdown_model["comms"]:
-            row = ct.add_row().cells
-            row[0].text = c.get("Stakeholder", "")
-            row[1].text = c.get("Information Needs", "")
-            row[2].text = c.get("Channel", "")
-            row[3].text = c.get("Frequency", "")
-            row[4].text = c.get("Owner", "")
+    comms = records(markdown_model["comms"])
+    if comms:
+        table(["Stakeholder/Group", "Information Needs", "Channel", "Frequency", "Owner"],
+              ["Stakeholder", "Information Needs", "Channel", "Frequency", "Owner"],
+              comms)
     else:
         doc.add_paragraph("Define stakeholders, information needs, channel, frequency, and owner.")
 
@@ -412,11 +391,68 @@ def plan_docx(markdown_model: Dict[str, Any]) -> bytes:
     else:
         doc.add_paragraph("Define measurable KPIs and acceptance criteria.")
 
-    # Save to bytes
+    # Save to an in-memory file, rewound for st.download_button
     buf = io.BytesIO()
     doc.save(buf)
     buf.seek(0)
-    return buf.read()
+    return buf
+
+
+def model_key(state: Mapping[str, Any]) -> str:
+    """Serialize the plan fields of `state` to a stable string for use as a cache key."""
+    return json.dumps([state.get(k) for k in PLAN_FIELDS], sort_keys=True, default=str)
+
+
+# The leading underscore keeps `_state` out of Streamlit's cache hashing; `key` covers it.
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60, max_entries=256)
+def cached_plan_markdown(key: str, _state: Mapping[str, Any]) -> str:
+    """Markdown plan, re-rendered only when the serialized model changes."""
+    return plan_markdown(_state)
+
+
+# Smaller bound: entries are whole DOCX files and only an explicit "Prepare" click adds one
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60, max_entries=32)
+def cached_plan_docx(key: str, _state: Mapping[str, Any]) -> io.BytesIO:
+    """DOCX plan, rebuilt only when the serialized model changes."""
+    return plan_docx(_state)
+
+
+# The editor tables (governance_roles, raci_rows, risks, milestones, comms) live in
+# session state column-wise as {column: values}; the renderers derive rows via records().
+def editor_frame(name: str, blank: Dict[str, Any]) -> "pd.DataFrame":
+    """Input frame for the `name` data editor; a single `blank` row when the table is empty."""
+    import pandas as pd
+    cols = st.session_state[name]
+    if row_count(cols):
+        return pd.DataFrame(cols, copy=False)
+    return pd.DataFrame([blank])
+
+
+def store_edits(name: str, edited: "pd.DataFrame") -> None:
+    """Save data editor output column-wise."""
+    st.session_state[name] = {col: edited[col].tolist() for col in edited.columns}
+
+
+def append_rows(name: str, rows: List[Dict[str, Any]]) -> None:
+    """Append row dicts to a column-stored table, padding any new or missing columns with None."""
+    cols = st.session_state[name]
+    n = row_count(cols)
+    for row in rows:
+        for col in row.keys() - cols.keys():
+            cols[col] = [None] * n
+        for col, values in cols.items():
+            values.append(row.get(col))
+        n += 1
+
+
+SCORED_RISK_FIELDS = ("Risk", "Probability", "Impact", "_score", "Mitigation", "Owner")
+
+
+def scored_risks(risk_rows: List[tuple]) -> List[Dict[str, Any]]:
+    """Rows for the scored risk register (SCORED_RISK_FIELDS tuples), highest P×I first."""
+    rows = sorted(risk_rows, key=itemgetter(3), reverse=True)
+    headers = ("Risk", "Probability", "Impact", "Risk Score (P×I)", "Mitigation", "Owner")
+    return [dict(zip(headers, row)) for row in rows]
 
 
 def init_state():
@@ -428,19 +464,20 @@ def init_state():
         "drivers": [],
         "objectives": [],
         "scope_summary": "",
-        "governance_roles": DEFAULT_GOV_ROLES.copy(),
         "gov_cadence": "SteerCo monthly; Delivery weekly; Risk review fortnightly",
         "gov_escalation": "PM → Program Director → Sponsor/SteerCo",
         "include_raci": False,
-        "raci_rows": [],
-        "risks": [],
-        "milestones": [],
-        "comms": [],
+        "raci_rows": {},
+        "risks": {},
+        "milestones": {},
+        "comms": {},
         "success_measures": []
     }
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
+    if "governance_roles" not in st.session_state:
+        st.session_state["governance_roles"] = {col: [r[col] for r in DEFAULT_GOV_ROLES] for col in DEFAULT_GOV_ROLES[0]}
 
 
 init_state()
@@ -471,7 +508,8 @@ tabs = st.tabs([
 # -------------------------------
 # Tab 1: Outcome & Drivers
 # -------------------------------
-with tabs[0]:
+# Tabs 1-5 collect their inputs in st.form blocks so edits rerun the script only on submit.
+with tabs[0], st.form("outcome_form"):
     st.subheader("Define the outcome")
     st.session_state["outcome"] = st.text_area(
         "What outcome are you trying to achieve?",
@@ -498,7 +536,8 @@ with tabs[0]:
         height=120
     )
 
-    if st.button("Generate draft objectives from outcome", type="primary"):
+    st.form_submit_button("Apply")
+    if st.form_submit_button("Generate draft objectives from outcome", type="primary"):
         st.session_state["objectives"] = suggest_objectives(
             st.session_state["outcome"],
             st.session_state["methodology"],
@@ -511,35 +550,37 @@ with tabs[0]:
 # Tab 2: Objectives
 # -------------------------------
 with tabs[1]:
-    st.subheader("Objectives")
-    st.caption("Refine to be specific and measurable (KPIs, dates, thresholds).")
-    objs = st.session_state["objectives"] or []
-    edited = []
-    max_rows = max(4, len(objs))
-    for i in range(max_rows):
-        val = objs[i] if i < len(objs) else ""
-        edited.append(st.text_input(f"Objective {i+1}", value=val, key=f"obj_{i}"))
-    st.session_state["objectives"] = [o.strip() for o in edited if o.strip()]
+    with st.form("objectives_form"):
+        st.subheader("Objectives")
+        st.caption("Refine to be specific and measurable (KPIs, dates, thresholds).")
+        objs = st.session_state["objectives"] or []
+        edited = []
+        max_rows = max(4, len(objs))
+        for i in range(max_rows):
+            val = objs[i] if i < len(objs) else ""
+            edited.append(st.text_input(f"Objective {i+1}", value=val, key=f"obj_{i}"))
+        st.session_state["objectives"] = [o.strip() for o in edited if o.strip()]
+        st.form_submit_button("Apply")
 
     st.subheader("Success measures (KPIs)")
-    kpi_new = st.text_input("Add a KPI (press Enter to add)", key="kpi_new")
-    if st.session_state.get("kpi_new") and st.session_state["kpi_new"].strip():
-        st.session_state["success_measures"].append(st.session_state["kpi_new"].strip())
-        st.session_state["kpi_new"] = ""
+    with st.form("kpi_form", clear_on_submit=True):
+        kpi_new = st.text_input("Add a KPI (press Enter to add)", key="kpi_new")
+        if st.form_submit_button("Add KPI") and kpi_new.strip():
+            st.session_state["success_measures"].append(kpi_new.strip())
     if st.session_state["success_measures"]:
-        st.write(pd.DataFrame({"KPI": st.session_state["success_measures"]}))
+        st.markdown("\n".join(f"- {k}" for k in st.session_state["success_measures"]))
 
 
 # -------------------------------
 # Tab 3: Governance
 # -------------------------------
-with tabs[2]:
+with tabs[2], st.form("governance_form"):
     st.subheader("Governance")
     st.session_state["gov_cadence"] = st.text_input("Governance cadence", st.session_state["gov_cadence"])
     st.session_state["gov_escalation"] = st.text_input("Escalation path", st.session_state["gov_escalation"])
 
     st.write("### Roles & Decision Rights")
-    gov_df = pd.DataFrame(st.session_state["governance_roles"])
+    gov_df = editor_frame("governance_roles", {"Role": "", "Name": "", "Decision Rights": ""})
     gov_edited = st.data_editor(
         gov_df,
         use_container_width=True,
@@ -547,18 +588,19 @@ with tabs[2]:
         key="gov_editor",
         column_config={"Decision Rights": st.column_config.TextColumn(width="large")}
     )
-    st.session_state["governance_roles"] = gov_edited.to_dict(orient="records")
+    store_edits("governance_roles", gov_edited)
 
     st.write("### RACI (optional)")
     st.session_state["include_raci"] = st.checkbox("Include a RACI table in the plan", value=st.session_state["include_raci"])
-    raci_df = pd.DataFrame(st.session_state.get("raci_rows", []) or [{"Item": "", "R": "", "A": "", "C": "", "I": ""}])
+    raci_df = editor_frame("raci_rows", {"Item": "", "R": "", "A": "", "C": "", "I": ""})
     raci_edit = st.data_editor(
         raci_df,
         use_container_width=True,
         num_rows="dynamic",
         key="raci_editor"
     )
-    st.session_state["raci_rows"] = raci_edit.to_dict(orient="records")
+    store_edits("raci_rows", raci_edit)
+    st.form_submit_button("Apply")
 
 
 # -------------------------------
@@ -569,53 +611,52 @@ with tabs[3]:
     st.caption("Start with suggested risks, then assign Probability, Impact, and Mitigation.")
     col_sg, col_btn = st.columns([4, 1])
     with col_sg:
-        suggested = suggest_risks(st.session_state["industry"], st.session_state["methodology"])
-        st.write("**Suggested risks (click to add):**")
-        for r in suggested:
-            if st.button(f"➕ {r}", key=f"addrisk_{hash(r)}"):
-                st.session_state["risks"].append({
-                    "Risk": r,
-                    "Probability": "Medium",
-                    "Impact": "Medium",
-                    "Mitigation": "",
-                    "Owner": ""
-                })
+        suggested = PRECOMPUTED_RISKS[(st.session_state["industry"], st.session_state["methodology"])]
+        with st.form("suggested_risks_form", clear_on_submit=True):
+            picks = st.multiselect("Suggested risks", options=suggested, default=[])
+            if st.form_submit_button("Add selected risks") and picks:
+                append_rows("risks", [
+                    {"Risk": r, "Probability": "Medium", "Impact": "Medium", "Mitigation": "", "Owner": ""}
+                    for r in picks
+                ])
 
     with col_btn:
         st.write("")
         if st.button("Clear all risks"):
-            st.session_state["risks"] = []
-
-    risk_df = pd.DataFrame(st.session_state["risks"] or [{"Risk":"", "Probability":"Medium", "Impact":"Medium", "Mitigation":"", "Owner":""}])
-    risk_edit = st.data_editor(
-        risk_df,
-        use_container_width=True,
-        num_rows="dynamic",
-        key="risk_editor",
-        column_config={
-            "Probability": st.column_config.SelectboxColumn(options=["Low","Medium","High"]),
-            "Impact": st.column_config.SelectboxColumn(options=["Low","Medium","High"]),
-            "Mitigation": st.column_config.TextColumn(width="large"),
-        }
-    )
-    st.session_state["risks"] = risk_edit.to_dict(orient="records")
+            st.session_state["risks"] = {}
+
+    with st.form("risks_form"):
+        risk_df = editor_frame("risks", {"Risk":"", "Probability":"Medium", "Impact":"Medium", "Mitigation":"", "Owner":""})
+        risk_edit = st.data_editor(
+            risk_df,
+            use_container_width=True,
+            num_rows="dynamic",
+            key="risk_editor",
+            column_config={
+                "Probability": st.column_config.SelectboxColumn(options=["Low","Medium","High"]),
+                "Impact": st.column_config.SelectboxColumn(options=["Low","Medium","High"]),
+                "Mitigation": st.column_config.TextColumn(width="large"),
+                "_score": None,
+            }
+        )
+        st.form_submit_button("Apply")
+    # P×I score, computed column-wise before the edits are stored
+    risk_edit["_score"] = (risk_edit["Probability"].map(SCORE).fillna(2) * risk_edit["Impact"].map(SCORE).fillna(2)).astype(int)
+    store_edits("risks", risk_edit)
 
     # Show risk scoring
-    if st.session_state["risks"]:
-        df_score = pd.DataFrame(st.session_state["risks"])
-        df_score["P"] = df_score["Probability"].map(p_label_to_score)
-        df_score["I"] = df_score["Impact"].map(i_label_to_score)
-        df_score["Risk Score (P×I)"] = df_score["P"] * df_score["I"]
+    if row_count(st.session_state["risks"]):
+        risk_rows = list(zip(*(st.session_state["risks"][c] for c in SCORED_RISK_FIELDS)))
         st.write("**Risk register (scored):**")
-        st.dataframe(df_score[["Risk", "Probability", "Impact", "Risk Score (P×I)", "Mitigation", "Owner"]].sort_values("Risk Score (P×I)", ascending=False), use_container_width=True)
+        st.dataframe(scored_risks(risk_rows), use_container_width=True)
 
 
 # -------------------------------
 # Tab 5: Milestones & Comms
 # -------------------------------
-with tabs[4]:
+with tabs[4], st.form("milestones_form"):
     st.subheader("Milestones")
-    m_df = pd.DataFrame(st.session_state["milestones"] or [{"Milestone":"", "Date":date.today(), "Acceptance Criteria":""}])
+    m_df = editor_frame("milestones", {"Milestone":"", "Date":date.today(), "Acceptance Criteria":""})
     m_edit = st.data_editor(
         m_df,
         use_container_width=True,
@@ -625,10 +666,10 @@ with tabs[4]:
             "Date": st.column_config.DateColumn()
         }
     )
-    st.session_state["milestones"] = m_edit.to_dict(orient="records")
+    store_edits("milestones", m_edit)
 
     st.subheader("Stakeholders & Communications")
-    c_df = pd.DataFrame(st.session_state["comms"] or [{"Stakeholder":"", "Information Needs":"", "Channel":"", "Frequency":"", "Owner":""}])
+    c_df = editor_frame("comms", {"Stakeholder":"", "Information Needs":"", "Channel":"", "Frequency":"", "Owner":""})
     c_edit = st.data_editor(
         c_df,
         use_container_width=True,
@@ -636,7 +677,8 @@ with tabs[4]:
         key="c_editor",
         column_config={"Information Needs": st.column_config.TextColumn(width="large")}
     )
-    st.session_state["comms"] = c_edit.to_dict(orient="records")
+    store_edits("comms", c_edit)
+    st.form_submit_button("Apply")
 
 
 # -------------------------------
@@ -644,33 +686,19 @@ with tabs[4]:
 # -------------------------------
 with tabs[5]:
     st.subheader("Review")
-    model = {
-        "outcome": st.session_state["outcome"],
-        "methodology": st.session_state["methodology"],
-        "industry": st.session_state["industry"],
-        "risk_appetite": st.session_state["risk_appetite"],
-        "drivers": st.session_state["drivers"],
-        "objectives": st.session_state["objectives"],
-        "scope_summary": st.session_state["scope_summary"],
-        "governance_roles": st.session_state["governance_roles"],
-        "gov_cadence": st.session_state["gov_cadence"],
-        "gov_escalation": st.session_state["gov_escalation"],
-        "include_raci": st.session_state["include_raci"],
-        "raci_rows": st.session_state["raci_rows"],
-        "risks": st.session_state["risks"],
-        "milestones": st.session_state["milestones"],
-        "comms": st.session_state["comms"],
-        "success_measures": st.session_state["success_measures"]
-    }
-
-    md = plan_markdown(model)
+    key = model_key(st.session_state)
+    md = cached_plan_markdown(key, st.session_state)
     st.markdown(md)
 
     st.subheader("Export")
     md_bytes = md.encode("utf-8")
     st.download_button("⬇️ Download Markdown", data=md_bytes, file_name="Project_Management_Plan.md", mime="text/markdown")
 
-    docx_bytes = plan_docx(model)
-    st.download_button("⬇️ Download Word (.docx)", data=docx_bytes, file_name="Project_Management_Plan.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+    # Build the DOCX only on request; a prepared file is kept until the plan changes
+    if st.button("Prepare Word download"):
+        st.session_state["_docx"] = (key, cached_plan_docx(key, st.session_state))
+    prepared_key, docx_buf = st.session_state.get("_docx", (None, None))
+    if prepared_key == key:
+        st.download_button("⬇️ Download Word (.docx)", data=docx_buf, file_name="Project_Management_Plan.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
 
 st.caption("Tip: Save your plan artifacts; this app does not persist data between sessions.")